@@ -5,18 +5,50 @@ This script allows humans to review, approve, or edit generated posts.
 It resumes the workflow after human feedback.
 """
 
-from workflow import SocialMediaWorkflow
+from workflow import SocialMediaWorkflow, log_progress_to, APPROVE_TOKENS
 from langgraph.checkpoint.sqlite import SqliteSaver
+from langgraph.types import Command
+from db import BatchedSqliteSaver, read_conn
+from text_length import MAX_TWEET_LENGTH, tweet_length
 import sys
 import os
 import io
-import sqlite3
+import logging
 
 # Fix Windows console encoding for emojis
 if sys.platform == 'win32':
     sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
     sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding='utf-8')
 
+log = logging.getLogger(__name__)
+
+# Banner separator, built once
+SEP = "=" * 60 + "\n"
+
+# Static part of the review prompt, emitted with a single write
+REVIEW_BANNER = (
+    f"\n{SEP}👤 HUMAN REVIEW\n{SEP}\n"
+    "Options:\n"
+    "  1. Type 'approve' (or 'yes', 'ok', 'publish') to publish the post\n"
+    "  2. Type editing instructions to regenerate the post\n"
+    "  3. Type 'quit' to exit without publishing\n"
+    "\n"
+    "Examples of editing instructions:\n"
+    "  - 'Make it more casual'\n"
+    "  - 'Add more emojis'\n"
+    "  - 'Focus on the main benefit'\n"
+    "  - 'Make it shorter'\n"
+    "  - 'Change tone to friendly'\n"
+    "\n"
+)
+
+# File written by main.py with the thread_id of the latest run
+THREAD_ID_PATH = os.path.join(os.path.dirname(__file__), "current_thread_id.txt")
+
+# Normalized feedback words that end the session
+# (approval words come from the workflow so both classify feedback the same way)
+_QUIT = frozenset({"quit", "exit", "q"})
+
 
 def get_current_thread_id() -> str:
     """
@@ -26,8 +58,8 @@ def get_current_thread_id() -> str:
         Thread ID string
     """
     # Try to read from file first
-    if os.path.exists("current_thread_id.txt"):
-        with open("current_thread_id.txt", "r") as f:
+    if os.path.exists(THREAD_ID_PATH):
+        with open(THREAD_ID_PATH, "r") as f:
             thread_id = f.read().strip()
             if thread_id:
                 return thread_id
@@ -48,59 +80,51 @@ def display_post(state: dict):
     Args:
         state: Current workflow state
     """
-    print("\n" + "=" * 60)
-    print("📋 GENERATED POST")
-    print("=" * 60)
-    print()
-    print(state.get("generated_post", "No post generated yet."))
-    print()
-    print("=" * 60)
-    print(f"Character count: {len(state.get('generated_post', ''))}")
-    print(f"Regeneration attempts: {state.get('iteration_count', 0)}")
-    print("=" * 60)
-    print()
-
-
-def get_human_feedback() -> str:
+    post = state.get("generated_post", "")
+    attempts = state.get("iteration_count", 0)
+    msg = (
+        f"\n{SEP}📋 GENERATED POST\n{SEP}\n"
+        f"{post or 'No post generated yet.'}\n\n"
+        f"{SEP}"
+        # Weighted the way Twitter counts (CJK/emoji = 2, URLs = 23), so this
+        # matches the limit enforced when publishing
+        f"Character count: {tweet_length(post)}/{MAX_TWEET_LENGTH}\n"
+        f"Regeneration attempts: {attempts}\n"
+        f"{SEP}\n"
+    )
+    if attempts >= SocialMediaWorkflow.MAX_ITERATIONS:
+        # Editing instructions won't be applied any more
+        msg += "⚠️  Last attempt: approve to publish; any other feedback ends the workflow.\n\n"
+    sys.stdout.write(msg)
+
+
+def get_human_feedback() -> tuple:
     """
     Get feedback from human (approve or edit instructions).
     
     Returns:
-        "approve" or editing instructions
+        Tuple of (kind, feedback) where kind is "approve", "edit" or "quit"
+        and feedback is the text exactly as the human typed it
     """
-    print("\n" + "=" * 60)
-    print("👤 HUMAN REVIEW")
-    print("=" * 60)
-    print()
-    print("Options:")
-    print("  1. Type 'approve' (or 'yes', 'ok', 'publish') to publish the post")
-    print("  2. Type editing instructions to regenerate the post")
-    print("  3. Type 'quit' to exit without publishing")
-    print()
-    print("Examples of editing instructions:")
-    print("  - 'Make it more casual'")
-    print("  - 'Add more emojis'")
-    print("  - 'Focus on the main benefit'")
-    print("  - 'Make it shorter'")
-    print("  - 'Change tone to friendly'")
-    print()
+    sys.stdout.write(REVIEW_BANNER)
     
     feedback = input("Your feedback: ").strip()
     
-    if feedback.lower() in ["quit", "exit", "q"]:
-        print("\n👋 Exiting without publishing.")
-        sys.exit(0)
+    # Normalize once (the same way the workflow does) and classify with set lookups
+    fb_norm = feedback.strip().casefold()
+    if fb_norm in _QUIT:
+        return "quit", feedback
+    if fb_norm in APPROVE_TOKENS:
+        return "approve", feedback
     
-    return feedback
+    return "edit", feedback
 
 
 def main():
     """
     Main function for human approval workflow.
     """
-    print("=" * 60)
-    print("👤 Human Approval Interface")
-    print("=" * 60)
+    sys.stdout.write(f"{SEP}👤 Human Approval Interface\n{SEP}")
     
     # Get thread ID
     thread_id = get_current_thread_id()
@@ -108,9 +132,10 @@ def main():
     
     # Initialize workflow with same checkpointer (same database file as main.py)
     # This allows approve_post.py to access state saved by main.py
-    db_path = os.path.join(os.path.dirname(__file__), ".checkpoints.db")
-    conn = sqlite3.connect(db_path, check_same_thread=False)
-    checkpointer = SqliteSaver(conn)
+    # Checkpoint writes are batched and committed once per workflow step
+    checkpointer = BatchedSqliteSaver()
+    # Make sure the checkpoint tables exist before opening read-only connections
+    checkpointer.setup()
     workflow = SocialMediaWorkflow(checkpointer=checkpointer)
     
     # Get current state
@@ -121,19 +146,32 @@ def main():
     }
     
     try:
-        # Get the current state from checkpoint
-        current_state = workflow.graph.get_state(config)
+        # Get the current state from checkpoint through a read-only connection
+        # so lookups don't contend with the writer
+        with read_conn() as conn:
+            reader = workflow.graph.copy(update={"checkpointer": SqliteSaver(conn, serde=checkpointer.serde)})
+            current_state = reader.get_state(config)
         
         if current_state is None or not current_state.values:
             print(f"\n❌ Error: No workflow state found for thread_id: {thread_id}")
             print("   Make sure you've run main.py first to generate a post.")
             sys.exit(1)
         
+        # A finished thread (published or capped) has nothing left to approve
+        if not current_state.next:
+            print("\nℹ️  Workflow already finished; nothing to approve.")
+            print("   Run main.py to start a new one.")
+            sys.exit(0)
+        
         # Display the generated post
         display_post(current_state.values)
         
         # Get human feedback
-        feedback = get_human_feedback()
+        kind, feedback = get_human_feedback()
+        
+        if kind == "quit":
+            print("\n👋 Exiting without publishing.")
+            sys.exit(0)
         
         if not feedback:
             print("\n⚠️  No feedback provided. Exiting.")
@@ -143,54 +181,55 @@ def main():
         print("\n▶️  Resuming workflow with your feedback...")
         print()
         
-        # Update state with feedback
-        updated_state = current_state.values.copy()
-        updated_state["human_feedback"] = feedback
-        
-        # Update the checkpoint state
-        workflow.graph.update_state(config, updated_state)
-        
         # Continue execution from where it was interrupted
-        # Remove interrupt to continue execution
-        continue_config = {
-            "configurable": {
-                "thread_id": thread_id
-            }
-        }
+        # The feedback is passed to the paused node with Command(resume=...);
+        # the classification is included so the workflow doesn't re-parse the text
+        resume = Command(resume={
+            "human_feedback": feedback,
+            "feedback_kind": kind
+        })
         
         # Stream the rest of the workflow
-        for event in workflow.graph.stream(None, config=continue_config):
-            # Process events as they come
-            pass
+        for event in workflow.graph.stream(
+            resume,
+            config=config,
+            durability=workflow.DURABILITY
+        ):
+            # Commit this step's checkpoint writes in a single transaction
+            checkpointer.flush()
+        
+        # Commit anything written after the last event
+        checkpointer.flush()
         
         # Check final state
         final_state = workflow.graph.get_state(config)
         
         if final_state.values.get("is_published", False):
-            print("\n" + "=" * 60)
-            print("✅ Workflow completed successfully!")
-            print("=" * 60)
+            sys.stdout.write(f"\n{SEP}✅ Workflow completed successfully!\n{SEP}")
         elif final_state.values.get("is_approved", False):
-            print("\n" + "=" * 60)
-            print("✅ Post approved but not published (check Twitter client)")
-            print("=" * 60)
+            sys.stdout.write(f"\n{SEP}✅ Post approved but not published (check Twitter client)\n{SEP}")
+        elif not final_state.next:
+            sys.stdout.write(f"\n{SEP}⏹️  Workflow ended without publishing.\n{SEP}")
         else:
-            print("\n" + "=" * 60)
-            print("📝 Post regenerated. Run this script again to review.")
-            print("=" * 60)
-            print(f"\n💡 Thread ID: {thread_id}")
-            print("   Run: python approve_post.py {thread_id}")
+            sys.stdout.write(
+                f"\n{SEP}📝 Post regenerated. Run this script again to review.\n{SEP}"
+                f"\n💡 Thread ID: {thread_id}\n"
+                f"   Run: python approve_post.py {thread_id}\n"
+            )
         
     except KeyboardInterrupt:
         print("\n\n⚠️  Interrupted by user.")
         sys.exit(0)
     except Exception as e:
         print(f"\n❌ Error: {str(e)}")
-        import traceback
-        traceback.print_exc()
+        log.exception("approval failed: %s", e)
         sys.exit(1)
 
 
 if __name__ == "__main__":
+    # Only failures are logged here; WARNING also keeps httpx's per-request INFO lines quiet
+    logging.basicConfig(level=logging.WARNING, format="%(asctime)s %(levelname)s %(message)s")
+    # Workflow nodes report progress through logging; show it like the rest of the output
+    log_progress_to(sys.stdout)
     main()
 
@@ -0,0 +1,215 @@
+"""
+Database Module
+===============
+This module manages the SQLite connections behind the LangGraph checkpointer.
+Every thread that touches the checkpoint database gets its own WAL-mode writer
+connection and its own small pool of read-only connections used for state
+lookups. Checkpoint writes are buffered and committed in one transaction per
+workflow step.
+"""
+
+import os
+import sqlite3
+import threading
+from contextlib import contextmanager
+
+from langgraph.checkpoint.sqlite import SqliteSaver
+
+from serde import ZstdSerializer
+
+# Both main.py and approve_post.py use the same database file to share state
+DB_PATH = os.path.join(os.path.dirname(__file__), ".checkpoints.db")
+
+# Number of idle read-only connections kept open for reuse (per thread)
+READ_POOL_SIZE = 4
+
+# WAL lets readers run while the writer commits; synchronous=NORMAL only
+# fsyncs at checkpoint time instead of on every transaction
+WRITER_PRAGMAS = """
+PRAGMA journal_mode=WAL;
+PRAGMA synchronous=NORMAL;
+PRAGMA busy_timeout=30000;
+PRAGMA cache_size=-1048576;
+PRAGMA temp_store=MEMORY;
+PRAGMA wal_autocheckpoint=1000;
+PRAGMA mmap_size=268435456;
+"""
+
+# Memory-mapped I/O (256MB) serves checkpoint reads from the page cache
+# without copying through read() calls
+READER_PRAGMAS = """
+PRAGMA busy_timeout=30000;
+PRAGMA temp_store=MEMORY;
+PRAGMA mmap_size=268435456;
+"""
+
+# Serializes buffered checkpoint writes across threads
+write_lock = threading.Lock()
+
+# Connections are never shared between threads, so sqlite3's
+# check_same_thread guard stays on
+_tls = threading.local()
+
+
+def get_writer_conn() -> sqlite3.Connection:
+    """
+    Get this thread's writer connection, opening it on first use.
+
+    Returns:
+        A WAL-mode SQLite connection for checkpoint writes
+    """
+    conn = getattr(_tls, "writer", None)
+    if conn is None:
+        conn = sqlite3.connect(DB_PATH)
+        conn.executescript(WRITER_PRAGMAS)
+        _tls.writer = conn
+
+    return conn
+
+
+@contextmanager
+def read_conn():
+    """
+    Borrow a read-only connection from this thread's pool.
+
+    The connection is returned to the pool when the block exits, or closed
+    if the pool is already full.
+
+    Yields:
+        A read-only SQLite connection
+    """
+    pool = getattr(_tls, "readers", None)
+    if pool is None:
+        pool = _tls.readers = []
+
+    if pool:
+        conn = pool.pop()
+    else:
+        conn = sqlite3.connect(f"file:{DB_PATH}?mode=ro", uri=True)
+        conn.executescript(READER_PRAGMAS)
+
+    try:
+        yield conn
+    finally:
+        if len(pool) < READ_POOL_SIZE:
+            pool.append(conn)
+        else:
+            conn.close()
+
+
+class _BufferedCursor:
+    """
+    Cursor stand-in that records statements instead of executing them.
+    """
+
+    def __init__(self, buffer: list):
+        self._buffer = buffer
+
+    def execute(self, query: str, params=()):
+        self._buffer.append((query, [tuple(params)]))
+
+    def executemany(self, query: str, rows):
+        # Materialize rows now so values are serialized at put() time
+        self._buffer.append((query, list(rows)))
+
+
+class BatchedSqliteSaver(SqliteSaver):
+    """
+    SqliteSaver that buffers checkpoint writes until flush() is called.
+
+    put() and put_writes() serialize their rows immediately but only queue
+    the INSERTs; flush() commits everything queued in a single
+    BEGIN IMMEDIATE ... COMMIT transaction. The connection is looked up per
+    thread through get_writer_conn(). Large payloads are zstd-compressed
+    unless another serde is passed.
+    """
+
+    def __init__(self, **kwargs):
+        kwargs.setdefault("serde", ZstdSerializer())
+        super().__init__(get_writer_conn(), **kwargs)
+        # Share the writer lock so every saver's buffer is serialized
+        self.lock = write_lock
+        self._pending = []
+        self._local = threading.local()
+
+    @property
+    def conn(self) -> sqlite3.Connection:
+        return get_writer_conn()
+
+    @conn.setter
+    def conn(self, value):
+        # SqliteSaver.__init__ assigns a connection; ours is resolved per thread
+        pass
+
+    @contextmanager
+    def cursor(self, transaction: bool = True):
+        if getattr(self._local, "buffering", False):
+            with self.lock:
+                yield _BufferedCursor(self._pending)
+            return
+        with super().cursor(transaction=transaction) as cur:
+            yield cur
+
+    @contextmanager
+    def _buffering(self):
+        self._local.buffering = True
+        try:
+            yield
+        finally:
+            self._local.buffering = False
+
+    def put(self, config, checkpoint, metadata, new_versions):
+        with self._buffering():
+            return super().put(config, checkpoint, metadata, new_versions)
+
+    def put_writes(self, config, writes, task_id, task_path=""):
+        with self._buffering():
+            super().put_writes(config, writes, task_id, task_path)
+
+    def get_tuple(self, config):
+        # Reads must see checkpoints that are still queued
+        self.flush()
+        return super().get_tuple(config)
+
+    def list(self, config, **kwargs):
+        self.flush()
+        return super().list(config, **kwargs)
+
+    def delete_thread(self, thread_id: str) -> None:
+        self.flush()
+        super().delete_thread(thread_id)
+
+    def flush(self) -> None:
+        """
+        Commit all queued checkpoint writes in one transaction.
+        """
+        with self.lock:
+            if not self._pending:
+                return
+
+            self.setup()
+
+            # Merge consecutive statements with the same SQL into one executemany
+            batches = []
+            for query, rows in self._pending:
+                if batches and batches[-1][0] == query:
+                    batches[-1][1].extend(rows)
+                else:
+                    batches.append((query, list(rows)))
+
+            cur = self.conn.cursor()
+            try:
+                # IMMEDIATE takes the write lock up front instead of failing
+                # with SQLITE_BUSY halfway through the batch
+                cur.execute("BEGIN IMMEDIATE")
+                for query, rows in batches:
+                    cur.executemany(query, rows)
+                cur.execute("COMMIT")
+            except Exception:
+                if self.conn.in_transaction:
+                    self.conn.rollback()
+                raise
+            finally:
+                cur.close()
+
+            self._pending.clear()
@@ -5,20 +5,28 @@ This script starts the workflow by reading a news article and generating a post.
 The workflow will interrupt and wait for human approval.
 """
 
-from workflow import SocialMediaWorkflow
-from langgraph.checkpoint.sqlite import SqliteSaver
+from workflow import SocialMediaWorkflow, log_progress_to
+from db import BatchedSqliteSaver
 import sys
 import uuid
 from datetime import datetime
 import io
+import logging
 import os
-import sqlite3
 
 # Fix Windows console encoding for emojis
 if sys.platform == 'win32':
     sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
     sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding='utf-8')
 
+log = logging.getLogger(__name__)
+
+# Banner separator, built once
+SEP = "=" * 60 + "\n"
+
+# File used to hand the current thread_id over to approve_post.py
+THREAD_ID_PATH = os.path.join(os.path.dirname(__file__), "current_thread_id.txt")
+
 
 def read_article_from_file(file_path: str) -> str:
     """
@@ -51,16 +59,8 @@ def read_article_from_input() -> str:
     print("Enter the news article text (press Ctrl+D or Ctrl+Z when finished):")
     print("-" * 60)
     
-    lines = []
-    try:
-        while True:
-            line = input()
-            lines.append(line)
-    except EOFError:
-        # User pressed Ctrl+D (Unix) or Ctrl+Z (Windows)
-        pass
-    
-    article = "\n".join(lines).strip()
+    # Read everything up to EOF (Ctrl+D on Unix, Ctrl+Z on Windows) in one call
+    article = sys.stdin.read().strip()
     
     if not article:
         print("❌ Error: No article text provided.")
@@ -69,21 +69,38 @@ def read_article_from_input() -> str:
     return article
 
 
+def save_thread_id(thread_id: str):
+    """
+    Save the thread_id for approve_post.py.
+    
+    The file is replaced atomically so a crash mid-write can't leave it
+    truncated, and the write is skipped if the file already holds this id.
+    
+    Args:
+        thread_id: The thread ID of the current workflow run
+    """
+    if os.path.exists(THREAD_ID_PATH):
+        with open(THREAD_ID_PATH, "r") as f:
+            if f.read().strip() == thread_id:
+                return
+    
+    tmp_path = THREAD_ID_PATH + ".tmp"
+    with open(tmp_path, "w") as f:
+        f.write(thread_id)
+    os.replace(tmp_path, THREAD_ID_PATH)
+
+
 def main():
     """
     Main function to start the social media post generation workflow.
     """
-    print("=" * 60)
-    print("🚀 Human-in-the-Loop Social Media Manager")
-    print("=" * 60)
-    print()
+    sys.stdout.write(f"{SEP}🚀 Human-in-the-Loop Social Media Manager\n{SEP}\n")
     
     # Initialize workflow with SqliteSaver for persistent state storage
     # SqliteSaver persists state to disk, allowing the workflow to resume after restart
-    # Both main.py and approve_post.py use the same database file to share state
-    db_path = os.path.join(os.path.dirname(__file__), ".checkpoints.db")
-    conn = sqlite3.connect(db_path, check_same_thread=False)
-    checkpointer = SqliteSaver(conn)
+    # Both main.py and approve_post.py use the same WAL-mode database file to share state
+    # Checkpoint writes are batched and committed once per workflow step
+    checkpointer = BatchedSqliteSaver()
     workflow = SocialMediaWorkflow(checkpointer=checkpointer)
     
     # Get article input
@@ -106,11 +123,10 @@ def main():
     
     try:
         # Run the workflow
-        # The workflow will interrupt at the "wait_for_approval" node
+        # The workflow will interrupt in the "process_feedback" node
         print("▶️  Starting workflow...")
         print()
         
-        # Use interrupt_before to pause before the wait_for_approval node
         config = {
             "configurable": {
                 "thread_id": thread_id
@@ -118,61 +134,43 @@ def main():
         }
         
         # Initial state
-        initial_state = {
-            "article": article,
-            "generated_post": "",
-            "human_feedback": "",
-            "is_approved": False,
-            "is_published": False,
-            "iteration_count": 0
-        }
-        
-        # Run until interrupt
-        # We'll interrupt before "wait_for_approval" to pause for human review
-        # LangGraph will automatically pause at the interrupt point
-        config_with_interrupt = {
-            "configurable": {
-                "thread_id": thread_id,
-                "interrupt_before": ["wait_for_approval"]
-            }
-        }
+        initial_state = SocialMediaWorkflow.initial_state(article)
         
         # Stream the workflow execution
-        # This will stop at the interrupt point (wait_for_approval node)
-        # The interrupt_before config will cause the workflow to pause
-        for event in workflow.graph.stream(initial_state, config=config_with_interrupt):
-            # Check state after each event to see if we're at an interrupt
-            current_state = workflow.graph.get_state(config_with_interrupt)
-            if current_state and hasattr(current_state, 'next') and current_state.next:
-                # Check if next node is wait_for_approval (meaning we're paused before it)
-                if any("wait_for_approval" in str(node) for node in current_state.next):
-                    # We've hit the interrupt point, break the loop
-                    break
-            # Also check event names
-            for node_name in event.keys():
-                if node_name == "wait_for_approval":
-                    # We've reached wait_for_approval, check if we should stop
-                    break
+        # The "process_feedback" node calls interrupt(), so the stream
+        # ends on its own when it reaches that point
+        for event in workflow.graph.stream(
+            initial_state,
+            config=config,
+            durability=workflow.DURABILITY
+        ):
+            # Commit this step's checkpoint writes in a single transaction
+            checkpointer.flush()
+        
+        # Commit anything written after the last event
+        checkpointer.flush()
         
-        print("\n" + "=" * 60)
-        print("✅ Workflow paused. Use approve_post.py to continue.")
-        print(f"   Thread ID: {thread_id}")
-        print("=" * 60)
+        sys.stdout.write(
+            f"\n{SEP}✅ Workflow paused. Use approve_post.py to continue.\n"
+            f"   Thread ID: {thread_id}\n{SEP}"
+        )
         
         # Save thread_id to a file so approve_post.py can use it
-        with open("current_thread_id.txt", "w") as f:
-            f.write(thread_id)
+        save_thread_id(thread_id)
         
     except KeyboardInterrupt:
         print("\n\n⚠️  Workflow interrupted by user.")
         sys.exit(0)
     except Exception as e:
         print(f"\n❌ Error: {str(e)}")
-        import traceback
-        traceback.print_exc()
+        log.exception("workflow failed: %s", e)
         sys.exit(1)
 #this file as be modified by team 
 
 if __name__ == "__main__":
+    # Only failures are logged here; WARNING also keeps httpx's per-request INFO lines quiet
+    logging.basicConfig(level=logging.WARNING, format="%(asctime)s %(levelname)s %(message)s")
+    # Workflow nodes report progress through logging; show it like the rest of the output
+    log_progress_to(sys.stdout)
     main()
 
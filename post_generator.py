@@ -7,18 +7,133 @@ Uses LangChain with Ollama to create engaging LinkedIn/X posts.
 
 from langchain_ollama import ChatOllama
 from langchain_core.prompts import ChatPromptTemplate
+import functools
 import os
+import requests
 from dotenv import load_dotenv
+from text_length import tweet_length
 
 # Load environment variables
 load_dotenv()
 
 
+# Ollama URLs that have already answered a health check
+_verified_urls = set()
+
+
+def _verify_ollama(base_url: str) -> None:
+    """
+    Check that Ollama is reachable at base_url.
+    
+    Only successful checks are remembered (per URL), so only the first
+    PostGenerator pays for the HTTP round trip. A failed check either raises
+    or warns, and is repeated next time.
+    
+    Args:
+        base_url: Ollama API base URL
+    """
+    if base_url in _verified_urls:
+        return
+    
+    try:
+        response = requests.get(f"{base_url}/api/tags", timeout=2)
+        if response.status_code != 200:
+            raise ConnectionError(f"Ollama API returned status {response.status_code}")
+    except requests.exceptions.ConnectionError:
+        raise ConnectionError(
+            "\n" + "="*60 + "\n"
+            "❌ Cannot connect to Ollama!\n\n"
+            "Please make sure Ollama is running:\n"
+            "1. Install Ollama from: https://ollama.ai\n"
+            "2. Start Ollama service\n"
+            "3. Pull a model: ollama pull llama3.2\n"
+            "4. Verify it's running: ollama list\n\n"
+            "Default Ollama URL: http://localhost:11434\n"
+            "You can change it in .env: OLLAMA_BASE_URL=your_url\n"
+            "="*60 + "\n"
+        )
+    except Exception as e:
+        print(f"⚠️  Warning: Could not verify Ollama connection: {e}")
+        print("   Continuing anyway...")
+        return
+    
+    _verified_urls.add(base_url)
+
+
+@functools.lru_cache(maxsize=4)
+def _make_llm(model: str, temperature: float, base_url: str, num_predict: int) -> ChatOllama:
+    """
+    Create (or reuse) a ChatOllama client.
+    
+    Instances are shared across PostGenerators with the same settings so the
+    underlying HTTP connection pool is reused.
+    
+    Args:
+        model: The Ollama model to use
+        temperature: Sampling temperature
+        base_url: Ollama API base URL
+        num_predict: Maximum number of tokens Ollama may generate
+        
+    Returns:
+        A ChatOllama chat model
+    """
+    return ChatOllama(
+        model=model,
+        temperature=temperature,
+        base_url=base_url,
+        num_predict=num_predict
+    )
+
+
 class PostGenerator:
     """
     Generates social media posts from news articles using Ollama (local LLM).
     """
     
+    # Prompt for generating a post from an article
+    GENERATE_MESSAGES = [
+        ("system", """You are an expert social media content creator specializing in LinkedIn and X (Twitter) posts.
+            
+Your task is to create engaging, professional posts that:
+- Capture the key insights from the article
+- Are concise and impactful (under {max_length} characters)
+- Use a {tone} tone
+- Include relevant hashtags (2-3 maximum)
+- Encourage engagement
+- Are suitable for professional social media platforms
+
+Format your response as a clean post without any additional commentary or explanations."""),
+        ("human", "Create a social media post based on this article:\n\n{article}")
+    ]
+    
+    # Prompt for revising a post based on user feedback
+    REGENERATE_MESSAGES = [
+        ("system", """You are an expert social media content creator.
+            
+Your task is to revise a social media post based on user feedback.
+- Follow the feedback instructions carefully
+- Maintain a {tone} tone
+- Keep it under {max_length} characters
+- Include relevant hashtags (2-3 maximum)
+- Make it engaging and professional
+
+Format your response as a clean post without any additional commentary."""),
+        ("human", """Original article:
+{article}
+
+User feedback/editing instructions:
+{feedback}
+
+Please regenerate the post based on this feedback.""")
+    ]
+    
+    # Follow-up prompt used when a generated post is over the length limit
+    SHORTEN_MESSAGES = [
+        ("system", "Shorten this post to under {max_length} characters, preserving hashtags. "
+                   "Respond with the post only, without any additional commentary."),
+        ("human", "{post}")
+    ]
+    
     def __init__(self, model_name=None, temperature=0.7, base_url=None):
         """
         Initialize the post generator with Ollama model.
@@ -36,123 +151,109 @@ class PostGenerator:
         if base_url is None:
             base_url = os.getenv("OLLAMA_BASE_URL", "http://localhost:11434")
         
-        # Check if Ollama is running
-        try:
-            import requests
-            response = requests.get(f"{base_url}/api/tags", timeout=2)
-            if response.status_code != 200:
-                raise ConnectionError(f"Ollama API returned status {response.status_code}")
-        except requests.exceptions.ConnectionError:
-            raise ConnectionError(
-                "\n" + "="*60 + "\n"
-                "❌ Cannot connect to Ollama!\n\n"
-                "Please make sure Ollama is running:\n"
-                "1. Install Ollama from: https://ollama.ai\n"
-                "2. Start Ollama service\n"
-                "3. Pull a model: ollama pull llama3.2\n"
-                "4. Verify it's running: ollama list\n\n"
-                "Default Ollama URL: http://localhost:11434\n"
-                "You can change it in .env: OLLAMA_BASE_URL=your_url\n"
-                "="*60 + "\n"
-            )
-        except Exception as e:
-            print(f"⚠️  Warning: Could not verify Ollama connection: {e}")
-            print("   Continuing anyway...")
-        
-        # Initialize the Ollama chat model
-        self.llm = ChatOllama(
-            model=model_name,
-            temperature=temperature,
-            base_url=base_url
-        )
+        # Check if Ollama is running (skipped after the first successful check)
+        _verify_ollama(base_url)
         
         # Get post preferences from environment
         self.tone = os.getenv("POST_TONE", "professional")
         self.max_length = int(os.getenv("POST_MAX_LENGTH", "280"))
+        
+        # Initialize the Ollama chat model (shared across instances)
+        # Cap the decode budget to roughly what fits in a post
+        self.llm = _make_llm(model_name, temperature, base_url, int(self.max_length * 1.5))
+        
+        # Build the prompt templates once with tone/max_length already filled in
+        self._gen_prompt = ChatPromptTemplate.from_messages(
+            self.GENERATE_MESSAGES
+        ).partial(tone=self.tone, max_length=str(self.max_length))
+        self._regen_prompt = ChatPromptTemplate.from_messages(
+            self.REGENERATE_MESSAGES
+        ).partial(tone=self.tone, max_length=str(self.max_length))
+        self._shorten_prompt = ChatPromptTemplate.from_messages(
+            self.SHORTEN_MESSAGES
+        ).partial(max_length=str(self.max_length))
+    
+    def _complete(self, formatted_prompt, on_token=None) -> str:
+        """
+        Stream a completion from the LLM and return the full text.
+        
+        Args:
+            formatted_prompt: Messages to send to the model
+            on_token: Optional callback invoked with each chunk of text as it arrives
+            
+        Returns:
+            The complete response text, stripped of surrounding whitespace
+        """
+        chunks = []
+        for chunk in self.llm.stream(formatted_prompt):
+            chunks.append(chunk.content)
+            if on_token is not None:
+                on_token(chunk.content)
+        
+        return "".join(chunks).strip()
+    
+    def _fit_length(self, post_content: str) -> str:
+        """
+        Ask the LLM to shorten a post once if it is over max_length.
+        
+        The rewrite is not streamed: the draft already went to on_token, and
+        streaming both would print two posts back to back.
+        
+        Args:
+            post_content: The generated post
+            
+        Returns:
+            The post, shortened if it was over the limit
+        """
+        # Measure with Twitter's weighted counter so we match its policy
+        if tweet_length(post_content) <= self.max_length:
+            return post_content
+        
+        formatted_prompt = self._shorten_prompt.format_messages(post=post_content)
+        return self._complete(formatted_prompt)
     
-    def generate_post(self, article_text: str) -> str:
+    def generate_post(self, article_text: str, on_token=None) -> str:
         """
         Generate a social media post from a news article.
         
         Args:
             article_text: The full text of the news article
+            on_token: Optional callback invoked with each chunk of text as it arrives
             
         Returns:
             A generated social media post
         """
-        # Create a prompt template for post generation
-        prompt = ChatPromptTemplate.from_messages([
-            ("system", """You are an expert social media content creator specializing in LinkedIn and X (Twitter) posts.
-            
-Your task is to create engaging, professional posts that:
-- Capture the key insights from the article
-- Are concise and impactful (under {max_length} characters)
-- Use a {tone} tone
-- Include relevant hashtags (2-3 maximum)
-- Encourage engagement
-- Are suitable for professional social media platforms
-
-Format your response as a clean post without any additional commentary or explanations."""),
-            ("human", "Create a social media post based on this article:\n\n{article}")
-        ])
-        
         # Format the prompt with article content
-        formatted_prompt = prompt.format_messages(
-            article=article_text,
-            tone=self.tone,
-            max_length=self.max_length
-        )
+        formatted_prompt = self._gen_prompt.format_messages(article=article_text)
         
-        # Generate the post using the LLM
-        response = self.llm.invoke(formatted_prompt)
+        # Generate the post using the LLM, streaming tokens as they arrive
+        post_content = self._complete(formatted_prompt, on_token)
         
-        # Extract the post text from the response
-        post_content = response.content.strip()
+        # Shorten here rather than failing later at publish time
+        post_content = self._fit_length(post_content)
         
         return post_content
     
-    def regenerate_post(self, article_text: str, feedback: str) -> str:
+    def regenerate_post(self, article_text: str, feedback: str, on_token=None) -> str:
         """
         Regenerate a post based on user feedback.
         
         Args:
             article_text: The original news article
             feedback: User's feedback/editing instructions
+            on_token: Optional callback invoked with each chunk of text as it arrives
             
         Returns:
             A regenerated social media post
         """
-        # Create a prompt that includes feedback
-        prompt = ChatPromptTemplate.from_messages([
-            ("system", """You are an expert social media content creator.
-            
-Your task is to revise a social media post based on user feedback.
-- Follow the feedback instructions carefully
-- Maintain a {tone} tone
-- Keep it under {max_length} characters
-- Include relevant hashtags (2-3 maximum)
-- Make it engaging and professional
-
-Format your response as a clean post without any additional commentary."""),
-            ("human", """Original article:
-{article}
-
-User feedback/editing instructions:
-{feedback}
-
-Please regenerate the post based on this feedback.""")
-        ])
-        
         # Format and generate
-        formatted_prompt = prompt.format_messages(
+        formatted_prompt = self._regen_prompt.format_messages(
             article=article_text,
-            feedback=feedback,
-            tone=self.tone,
-            max_length=self.max_length
+            feedback=feedback
         )
         
-        response = self.llm.invoke(formatted_prompt)
-        post_content = response.content.strip()
+        post_content = self._complete(formatted_prompt, on_token)
+        post_content = self._fit_length(post_content)
         
         return post_content
 
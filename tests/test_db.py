@@ -0,0 +1,73 @@
+"""
+Tests for the batched SQLite checkpointer.
+"""
+
+import os
+import sys
+import threading
+from typing import TypedDict
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from langgraph.checkpoint.sqlite import SqliteSaver
+from langgraph.graph import StateGraph, END
+
+import db
+from db import BatchedSqliteSaver, read_conn
+
+
+class _State(TypedDict):
+    article: str
+    generated_post: str
+
+
+@pytest.fixture
+def saver(tmp_path, monkeypatch):
+    # Fresh database file and fresh per-thread connections for each test
+    monkeypatch.setattr(db, "DB_PATH", str(tmp_path / "checkpoints.db"))
+    monkeypatch.setattr(db, "_tls", threading.local())
+    saver = BatchedSqliteSaver()
+    saver.setup()
+    yield saver
+    saver.conn.close()
+
+
+def _build_graph(checkpointer):
+    graph = StateGraph(_State)
+    graph.add_node("generate", lambda state: {"generated_post": "post"})
+    graph.set_entry_point("generate")
+    graph.add_edge("generate", END)
+    return graph.compile(checkpointer=checkpointer)
+
+
+def _read_tuple(saver, config):
+    # Read through a separate read-only connection, as approve_post.py does
+    with read_conn() as conn:
+        return SqliteSaver(conn, serde=saver.serde).get_tuple(config)
+
+
+def test_puts_are_buffered_until_flush(saver):
+    config = {"configurable": {"thread_id": "t1"}}
+    _build_graph(saver).invoke({"article": "a", "generated_post": ""}, config)
+
+    assert saver._pending
+    assert _read_tuple(saver, config) is None
+
+    saver.flush()
+
+    assert not saver._pending
+    tup = _read_tuple(saver, config)
+    assert tup.checkpoint["channel_values"] == {"article": "a", "generated_post": "post"}
+
+
+def test_get_tuple_sees_queued_writes(saver):
+    config = {"configurable": {"thread_id": "t2"}}
+    _build_graph(saver).invoke({"article": "b", "generated_post": ""}, config)
+
+    # The saver's own reads flush first
+    tup = saver.get_tuple(config)
+
+    assert tup.checkpoint["channel_values"]["generated_post"] == "post"
+    assert _read_tuple(saver, config) is not None
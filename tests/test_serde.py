@@ -0,0 +1,63 @@
+"""
+Tests for the zstd checkpoint serializer.
+"""
+
+import os
+import sqlite3
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from langgraph.checkpoint.base import empty_checkpoint
+from langgraph.checkpoint.serde.jsonplus import JsonPlusSerializer
+from langgraph.checkpoint.sqlite import SqliteSaver
+
+from serde import COMPRESS_THRESHOLD, ZSTD_SUFFIX, ZstdSerializer
+
+
+def test_large_payload_round_trips_compressed():
+    serde = ZstdSerializer()
+    article = "The market rallied after the news. " * 200
+
+    typ, data = serde.dumps_typed({"article": article})
+
+    assert typ.endswith(ZSTD_SUFFIX)
+    assert len(data) < len(article)
+    assert serde.loads_typed((typ, data)) == {"article": article}
+
+
+def test_small_payload_is_stored_as_is():
+    serde = ZstdSerializer()
+
+    typ, data = serde.dumps_typed({"post": "hi"})
+
+    assert not typ.endswith(ZSTD_SUFFIX)
+    assert len(data) < COMPRESS_THRESHOLD
+    assert serde.loads_typed((typ, data)) == {"post": "hi"}
+
+
+def test_uncompressed_rows_written_before_compression_still_load():
+    conn = sqlite3.connect(":memory:", check_same_thread=False)
+    config = {"configurable": {"thread_id": "t1", "checkpoint_ns": ""}}
+    article = "x" * (COMPRESS_THRESHOLD * 4)
+
+    # A checkpoint written by a plain SqliteSaver, before compression existed
+    old = empty_checkpoint()
+    old["channel_values"] = {"article": article}
+    plain = SqliteSaver(conn, serde=JsonPlusSerializer())
+    plain.put(config, old, {}, {})
+
+    # ...and a newer one written with compression on the same thread
+    new = empty_checkpoint()
+    new["channel_values"] = {"article": article + "!"}
+    saver = SqliteSaver(conn, serde=ZstdSerializer())
+    saver.put(config, new, {}, {})
+
+    types = sorted(row[0] for row in conn.execute("SELECT type FROM checkpoints"))
+    assert types == ["msgpack", "msgpack" + ZSTD_SUFFIX]
+
+    loaded = {
+        tup.checkpoint["id"]: tup.checkpoint["channel_values"]["article"]
+        for tup in saver.list({"configurable": {"thread_id": "t1"}})
+    }
+    assert loaded == {old["id"]: article, new["id"]: article + "!"}
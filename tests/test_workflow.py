@@ -0,0 +1,80 @@
+"""
+Tests for the workflow's in-memory checkpointer.
+"""
+
+import gc
+import os
+import sys
+import threading
+import time
+from typing import TypedDict
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from langgraph.graph import StateGraph, END
+
+import workflow
+from workflow import TTLMemorySaver
+
+
+class _State(TypedDict):
+    article: str
+    generated_post: str
+
+
+def _build_graph(checkpointer):
+    graph = StateGraph(_State)
+    graph.add_node("generate", lambda state: {"generated_post": "post"})
+    graph.set_entry_point("generate")
+    graph.add_edge("generate", END)
+    return graph.compile(checkpointer=checkpointer)
+
+
+def _run(graph, thread_id):
+    config = {"configurable": {"thread_id": thread_id}}
+    graph.invoke({"article": "a", "generated_post": ""}, config)
+    return config
+
+
+def test_expired_thread_is_evicted_on_read():
+    saver = TTLMemorySaver(ttl_seconds=0.05)
+    graph = _build_graph(saver)
+    config = _run(graph, "t1")
+
+    assert saver.get_tuple(config) is not None
+    time.sleep(0.1)
+    assert saver.get_tuple(config) is None
+    assert "t1" not in saver.storage
+
+
+def test_sweep_drops_only_expired_threads():
+    saver = TTLMemorySaver(ttl_seconds=0.05)
+    graph = _build_graph(saver)
+    _run(graph, "old")
+    time.sleep(0.1)
+    _run(graph, "new")
+
+    saver.sweep()
+
+    assert set(saver.storage) == {"new"}
+
+
+def test_no_ttl_keeps_threads():
+    saver = TTLMemorySaver()
+    graph = _build_graph(saver)
+    config = _run(graph, "t1")
+
+    saver.sweep()
+
+    assert saver.get_tuple(config) is not None
+
+
+def test_unclosed_savers_share_one_sweeper_and_are_collected():
+    before = threading.active_count()
+    for _ in range(50):
+        _run(_build_graph(TTLMemorySaver(ttl_seconds=60)), "t")
+    gc.collect()
+
+    # At most the one shared sweeper thread was started
+    assert threading.active_count() <= before + 1
+    assert len(workflow._ttl_savers) == 0
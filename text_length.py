@@ -0,0 +1,27 @@
+"""
+Text Length Module
+==================
+This module measures post length the way Twitter/X counts it.
+It only needs twitter-text-parser, so post generation works without Tweepy.
+"""
+
+from twitter_text import parse_tweet
+
+# Twitter's limit, in weighted characters
+MAX_TWEET_LENGTH = 280
+
+
+def tweet_length(text: str) -> int:
+    """
+    Count the length of a post the way Twitter does.
+    
+    CJK characters and emojis count as 2 and every URL counts as 23,
+    regardless of its actual length.
+    
+    Args:
+        text: The post text
+        
+    Returns:
+        Weighted length of the text
+    """
+    return parse_tweet(text).weightedLength
@@ -7,11 +7,16 @@ Provides functions to publish posts to Twitter.
 
 import tweepy
 import os
+import time
 from dotenv import load_dotenv
+from text_length import MAX_TWEET_LENGTH, tweet_length
 
 # Load environment variables
 load_dotenv()
 
+# How long a successful credential check is trusted, in seconds
+VERIFY_TTL = 300
+
 
 class TwitterClient:
     """
@@ -37,24 +42,41 @@ class TwitterClient:
                 "TWITTER_ACCESS_TOKEN, TWITTER_ACCESS_TOKEN_SECRET"
             )
         
-        # Initialize Tweepy OAuth1UserHandler for user authentication
-        # OAuth1 is used for posting tweets on behalf of a user
-        auth = tweepy.OAuth1UserHandler(
-            api_key,
-            api_secret,
-            access_token,
-            access_token_secret
+        # Create a v2 API client with OAuth1 user context
+        # User context is needed for posting tweets on behalf of a user
+        self.client = tweepy.Client(
+            consumer_key=api_key,
+            consumer_secret=api_secret,
+            access_token=access_token,
+            access_token_secret=access_token_secret,
+            wait_on_rate_limit=True
         )
         
-        # Create API client with authentication
-        self.api = tweepy.API(auth, wait_on_rate_limit=True)
+        # Username is looked up lazily, only when a tweet URL is needed
+        self._username = None
         
-        # Verify credentials by getting user info
-        try:
-            self.user = self.api.verify_credentials()
-            print(f"✓ Successfully authenticated as: @{self.user.screen_name}")
-        except Exception as e:
-            raise Exception(f"Failed to authenticate with Twitter: {str(e)}")
+        # Monotonic time of the last successful credential check
+        self._verified_at = None
+    
+    @property
+    def username(self) -> str:
+        """
+        The authenticated user's handle, fetched on first use.
+        
+        Returns:
+            Twitter username (without the @)
+        """
+        if self._username is None:
+            self._fetch_me()
+        return self._username
+    
+    def _fetch_me(self):
+        """
+        Look up the authenticated user, which also verifies the credentials.
+        """
+        me = self.client.get_me(user_fields=["username"])
+        self._username = me.data.username
+        self._verified_at = time.monotonic()
     
     def publish_post(self, post_text: str) -> dict:
         """
@@ -67,22 +89,29 @@ class TwitterClient:
             Dictionary with status information including tweet ID and URL
         """
         try:
-            # Check if post is too long (Twitter limit is 280 characters)
-            if len(post_text) > 280:
+            # Check if post is too long (Twitter limit is 280 weighted characters)
+            length = tweet_length(post_text)
+            if length > MAX_TWEET_LENGTH:
                 raise ValueError(
-                    f"Post is too long ({len(post_text)} characters). "
-                    "Twitter limit is 280 characters."
+                    f"Post is too long ({length} characters). "
+                    f"Twitter limit is {MAX_TWEET_LENGTH} characters."
                 )
             
-            # Post the tweet using Tweepy
-            tweet = self.api.update_status(status=post_text)
+            # Post the tweet using the v2 endpoint
+            resp = self.client.create_tweet(text=post_text)
+            tweet_id = resp.data["id"]
             
             # Construct tweet URL
-            tweet_url = f"https://twitter.com/{self.user.screen_name}/status/{tweet.id}"
+            # The tweet is already posted, so fall back to the generic URL
+            # form rather than reporting failure if the username lookup fails
+            try:
+                tweet_url = f"https://twitter.com/{self.username}/status/{tweet_id}"
+            except Exception:
+                tweet_url = f"https://twitter.com/i/web/status/{tweet_id}"
             
             return {
                 "success": True,
-                "tweet_id": tweet.id,
+                "tweet_id": tweet_id,
                 "tweet_url": tweet_url,
                 "text": post_text,
                 "message": f"Post published successfully! View at: {tweet_url}"
@@ -111,8 +140,12 @@ class TwitterClient:
         Returns:
             True if connection is successful, False otherwise
         """
+        # Skip the API call if credentials were verified recently
+        if self._verified_at is not None and time.monotonic() - self._verified_at < VERIFY_TTL:
+            return True
+        
         try:
-            self.api.verify_credentials()
+            self._fetch_me()
             return True
         except Exception as e:
             print(f"Connection test failed: {str(e)}")
@@ -5,11 +5,72 @@ This module defines the LangGraph workflow with interrupts and checkpoints.
 The workflow generates a post and then pauses for human approval.
 """
 
-from typing import TypedDict
+import asyncio
+import functools
+import logging
+import sqlite3
+import sys
+import threading
+import time
+import uuid
+import weakref
+from contextlib import ExitStack
+from typing import Annotated, TypedDict
 from langgraph.graph import StateGraph, END
 from langgraph.checkpoint.memory import MemorySaver
+from langgraph.checkpoint.sqlite import SqliteSaver
+from langgraph.types import Command, interrupt
+from db import WRITER_PRAGMAS
+from serde import ZstdSerializer
 from post_generator import PostGenerator
 
+# Twitter support is optional; publishing reports an error without it
+try:
+    from twitter_client import TwitterClient
+except ImportError:
+    TwitterClient = None
+
+log = logging.getLogger(__name__)
+
+
+# Feedback (after strip/casefold) that counts as approval
+APPROVE_TOKENS = frozenset({"approve", "yes", "ok", "publish", "y"})
+
+# Pending-write channel LangGraph uses to record an interrupt() on a checkpoint
+_INTERRUPT_CHANNEL = "__interrupt__"
+
+# Next step after process_feedback, keyed by (is_approved, at_iteration_cap)
+_ROUTE = {
+    (True, False): "publish",
+    (True, True): "publish",
+    (False, False): "regenerate",
+    (False, True): "end",
+}
+
+# How long an idle thread's checkpoints are kept, in seconds
+# (comfortably longer than a human approval window)
+DEFAULT_TTL_SECONDS = 24 * 60 * 60
+
+# How often the in-memory saver drops expired threads, in seconds
+SWEEP_INTERVAL = 60
+
+
+def _count_attempts(current: int, delta: int) -> int:
+    """
+    Reducer for iteration_count: add each node's increment to the total.
+    
+    A 0 (as passed in the initial state of a new run) resets the count, so
+    starting over on an existing thread_id doesn't inherit its attempts.
+    
+    Args:
+        current: The stored count
+        delta: The value written by a node or the caller
+        
+    Returns:
+        The new count
+    """
+    return current + delta if delta else 0
+
 
 # Define the state structure for our workflow
 class WorkflowState(TypedDict):
@@ -20,16 +81,276 @@ class WorkflowState(TypedDict):
         article: The original news article text
         generated_post: The AI-generated social media post
         human_feedback: Feedback from human (approve/edit instructions)
+        feedback_kind: Pre-classified feedback ("approve"/"edit"), if the caller provided one
         is_approved: Whether the post has been approved
         is_published: Whether the post has been published to Twitter
-        iteration_count: Number of regeneration attempts
+        iteration_count: Number of regeneration attempts (nodes write increments)
+    
+    Nodes return only the fields they change, so each step only writes
+    (and checkpoints) those channels instead of the whole state.
     """
     article: str
     generated_post: str
     human_feedback: str
+    feedback_kind: str
     is_approved: bool
     is_published: bool
-    iteration_count: int
+    iteration_count: Annotated[int, _count_attempts]
+
+
+def log_progress_to(stream=None) -> logging.Handler:
+    """
+    Print this module's progress messages as plain lines, like the CLI's own output.
+    
+    Only the workflow logger is affected; other loggers (and errors logged
+    by the CLIs) keep the root configuration.
+    
+    Args:
+        stream: Where to write (default: sys.stdout at call time)
+        
+    Returns:
+        The handler that was added
+    """
+    handler = logging.StreamHandler(stream if stream is not None else sys.stdout)
+    handler.setFormatter(logging.Formatter("%(message)s"))
+    log.addHandler(handler)
+    log.setLevel(logging.INFO)
+    # Don't repeat the same lines through the root handler
+    log.propagate = False
+    return handler
+
+
+def _dispatch(name: str):
+    """
+    Create a graph callable that forwards to a SocialMediaWorkflow method.
+    
+    The compiled graph is shared by all workflow instances, so nodes look up
+    the instance they belong to in the run config instead of closing over it.
+    
+    Args:
+        name: Name of the SocialMediaWorkflow method to call
+        
+    Returns:
+        A function usable as a node or conditional edge
+    """
+    def call(state, config):
+        return getattr(config["configurable"]["social_media_workflow"], name)(state)
+    
+    call.__name__ = name
+    return call
+
+
+@functools.cache
+def _shared_post_generator():
+    """
+    Get the process-wide post generator, creating it on first use.
+    
+    All workflow instances share one generator, so the Ollama check and the
+    prompt templates are done once per process. It holds no per-run state,
+    so sharing it across threads is safe. Construction errors (e.g. Ollama
+    not running) are raised and not cached.
+    
+    Returns:
+        A PostGenerator instance
+    """
+    return PostGenerator()
+
+
+@functools.lru_cache(maxsize=1)
+def _get_twitter_client():
+    """
+    Get the process-wide Twitter client, creating it on first use.
+    
+    Sharing one client reuses its HTTP session (and cached user lookup)
+    across publishes. Construction errors are raised and not cached, so a
+    fixed .env is picked up on the next attempt.
+    
+    Returns:
+        A TwitterClient instance
+    """
+    if TwitterClient is None:
+        raise ImportError("Twitter support is not installed (pip install tweepy)")
+    return TwitterClient()
+
+
+class TTLMemorySaver(MemorySaver):
+    """
+    MemorySaver that drops threads which have not been written for ttl_seconds.
+    
+    Expired threads are evicted when read, and by a single module-level
+    sweeper thread that runs every SWEEP_INTERVAL seconds. The sweeper only
+    holds savers weakly, so an unclosed saver is still garbage-collected and
+    no thread is left behind per instance.
+    """
+    
+    def __init__(self, ttl_seconds=None, **kwargs):
+        super().__init__(**kwargs)
+        self.ttl_seconds = ttl_seconds
+        # Monotonic expiry time per thread_id; the lock guards storage against the sweeper
+        self._expires = {}
+        self._store_lock = threading.Lock()
+        if ttl_seconds is not None:
+            _register_for_sweep(self)
+    
+    def put(self, config, checkpoint, metadata, new_versions):
+        thread_id = config["configurable"]["thread_id"]
+        with self._store_lock:
+            if self.ttl_seconds is not None:
+                # Every write pushes the thread's expiry back
+                self._expires[thread_id] = time.monotonic() + self.ttl_seconds
+            return super().put(config, checkpoint, metadata, new_versions)
+    
+    def put_writes(self, config, writes, task_id, task_path=""):
+        with self._store_lock:
+            super().put_writes(config, writes, task_id, task_path)
+    
+    def get_tuple(self, config):
+        if self._evict(config["configurable"]["thread_id"]):
+            return None
+        return super().get_tuple(config)
+    
+    def list(self, config, **kwargs):
+        if config is not None:
+            self._evict(config["configurable"]["thread_id"])
+        return super().list(config, **kwargs)
+    
+    def delete_thread(self, thread_id):
+        with self._store_lock:
+            self._expires.pop(thread_id, None)
+            super().delete_thread(thread_id)
+    
+    def sweep(self):
+        """
+        Drop every expired thread.
+        """
+        now = time.monotonic()
+        for thread_id, expires_at in list(self._expires.items()):
+            if expires_at <= now:
+                self._evict(thread_id)
+    
+    def _evict(self, thread_id):
+        """
+        Drop a thread's checkpoints if its TTL has passed.
+        
+        Returns:
+            True if the thread was dropped
+        """
+        if self.ttl_seconds is None:
+            return False
+        
+        with self._store_lock:
+            expires_at = self._expires.get(thread_id)
+            if expires_at is None or expires_at > time.monotonic():
+                return False
+            del self._expires[thread_id]
+            super().delete_thread(thread_id)
+        return True
+
+
+# Savers with a TTL, swept by one shared background thread
+_ttl_savers = weakref.WeakSet()
+_sweeper_lock = threading.Lock()
+_sweeper = None
+
+
+def _register_for_sweep(saver: TTLMemorySaver):
+    """
+    Add a saver to the shared sweep, starting the sweeper thread if needed.
+    
+    Args:
+        saver: The saver to sweep
+    """
+    global _sweeper
+    with _sweeper_lock:
+        _ttl_savers.add(saver)
+        if _sweeper is None:
+            _sweeper = threading.Thread(target=_sweep_loop, name="checkpoint-ttl-sweeper", daemon=True)
+            _sweeper.start()
+
+
+def _sweep_loop():
+    """
+    Sweep every registered saver until none are left.
+    """
+    global _sweeper
+    while True:
+        time.sleep(SWEEP_INTERVAL)
+        for saver in list(_ttl_savers):
+            saver.sweep()
+        # Don't keep the last saver alive until the next round
+        saver = None
+        with _sweeper_lock:
+            if not _ttl_savers:
+                _sweeper = None
+                return
+
+
+def _build_checkpointer(cfg: dict, stack: ExitStack, ttl_seconds=DEFAULT_TTL_SECONDS):
+    """
+    Create a checkpointer from a configuration dict.
+    
+    Postgres, Redis and MongoDB savers are imported only when requested, so
+    their packages (langgraph-checkpoint-postgres, -redis, -mongodb) are
+    optional.
+    
+    Args:
+        cfg: Checkpointer settings:
+            db_type: "memory", "sqlite", "postgres", "redis" or "mongodb"
+            db_uri: Database file path or connection string
+            db_name: Database name (mongodb only, optional)
+            ttl: Backend-specific expiry settings (redis/mongodb only, optional;
+                defaults to ttl_seconds)
+        stack: ExitStack that owns any connections opened here
+        ttl_seconds: Idle time after which a thread's checkpoints expire
+            (memory/redis/mongodb; None keeps them forever)
+        
+    Returns:
+        A checkpointer instance
+    """
+    db_type = cfg.get("db_type", "memory")
+    uri = cfg.get("db_uri")
+    
+    if db_type == "memory":
+        return TTLMemorySaver(ttl_seconds=ttl_seconds)
+    
+    if db_type == "sqlite":
+        # SqliteSaver serializes access with its own lock, and LangGraph may
+        # write checkpoints from a background thread
+        conn = sqlite3.connect(uri, check_same_thread=False)
+        conn.executescript(WRITER_PRAGMAS)
+        stack.callback(conn.close)
+        # Articles compress well, so store large checkpoints zstd-compressed
+        return SqliteSaver(conn, serde=ZstdSerializer())
+    
+    if db_type == "postgres":
+        from langgraph.checkpoint.postgres import PostgresSaver
+        saver = stack.enter_context(PostgresSaver.from_conn_string(uri))
+        # Create tables on first use
+        saver.setup()
+        return saver
+    
+    if db_type == "redis":
+        from langgraph.checkpoint.redis import RedisSaver
+        # RedisSaver writes each checkpoint and its index atomically and
+        # applies TTLs natively (EXPIRE, in minutes) when configured
+        ttl = cfg.get("ttl")
+        if ttl is None and ttl_seconds is not None:
+            ttl = {"default_ttl": ttl_seconds / 60, "refresh_on_read": True}
+        saver = stack.enter_context(RedisSaver.from_conn_string(uri, ttl=ttl))
+        # Create search indexes on first use
+        saver.setup()
+        return saver
+    
+    if db_type == "mongodb":
+        from langgraph.checkpoint.mongodb import MongoDBSaver
+        # MongoDB expires documents with a TTL index, in seconds
+        return stack.enter_context(MongoDBSaver.from_conn_string(
+            uri,
+            cfg.get("db_name", "checkpointing_db"),
+            ttl=cfg.get("ttl", ttl_seconds)
+        ))
+    
+    raise ValueError(f"Unsupported checkpointer db_type: {db_type}")
 
 
 class SocialMediaWorkflow:
@@ -37,32 +358,69 @@ class SocialMediaWorkflow:
     LangGraph workflow for human-in-the-loop social media post generation.
     """
     
-    def __init__(self, checkpointer=None):
+    # Only checkpoint when a run stops (at the approval interrupt or at the end).
+    # Those are the only states anyone resumes from, so the intermediate
+    # generate_post / process_feedback checkpoints are skipped.
+    DURABILITY = "exit"
+    
+    # Maximum number of generated posts per run (prevents infinite loops)
+    MAX_ITERATIONS = 5
+    
+    def __init__(self, checkpointer=None, checkpointer_config=None, ttl_seconds=DEFAULT_TTL_SECONDS):
         """
         Initialize the workflow with an optional checkpointer.
         
         Args:
             checkpointer: A checkpointer instance (e.g., MemorySaver) for state persistence
+            checkpointer_config: Settings used to build a checkpointer when none is given,
+                e.g. {"db_type": "sqlite", "db_uri": "checkpoints.db"}
+                (see _build_checkpointer for the supported keys)
+            ttl_seconds: Idle time after which a thread's checkpoints are dropped
+                from a checkpointer created here (None keeps them forever)
         """
-        # Initialize the post generator
-        self.post_generator = PostGenerator()
+        # Use the shared post generator
+        self.post_generator = _shared_post_generator()
         
-        # Create checkpointer if not provided (uses MemorySaver by default)
-        # MemorySaver persists state in memory, allowing workflow to resume after restart
-        if checkpointer is None:
-            self.checkpointer = MemorySaver()
-        else:
+        # Connections opened for a checkpointer created here;
+        # a checkpointer passed in by the caller is theirs to close
+        self._resources = ExitStack()
+        
+        # Create checkpointer if not provided
+        # A configured database backend keeps paused workflows across restarts;
+        # otherwise an in-memory saver keeps state for this process only
+        if checkpointer is not None:
             self.checkpointer = checkpointer
+        elif checkpointer_config is not None:
+            self.checkpointer = _build_checkpointer(checkpointer_config, self._resources, ttl_seconds)
+        else:
+            # Expire idle threads so a long-running process doesn't grow without bound
+            self.checkpointer = TTLMemorySaver(ttl_seconds=ttl_seconds)
         
         # Build the workflow graph
         self.graph = self._build_graph()
     
-    def _build_graph(self) -> StateGraph:
+    def _build_graph(self):
         """
-        Build the LangGraph workflow with nodes and edges.
+        Attach this instance's checkpointer to the shared compiled graph.
+        
+        Copying the compiled graph is much cheaper than building and
+        compiling a new StateGraph for every instance.
         
         Returns:
-            A compiled StateGraph ready for execution
+            A compiled graph ready for execution
+        """
+        return self._compile_shared_graph().copy(
+            update={"checkpointer": self.checkpointer}
+        ).with_config(configurable={"social_media_workflow": self})
+    
+    @staticmethod
+    @functools.cache
+    def _compile_shared_graph():
+        """
+        Build the LangGraph workflow with nodes and edges (once per process).
+        
+        Returns:
+            A compiled StateGraph without a checkpointer
         """
         # Create a new StateGraph with our WorkflowState
         workflow = StateGraph(WorkflowState)
@@ -71,32 +429,26 @@ class SocialMediaWorkflow:
         # Each node is a function that processes the state
         
         # Node 1: Generate post from article
-        workflow.add_node("generate_post", self._generate_post_node)
-        
-        # Node 2: Wait for human approval (this is where we interrupt)
-        workflow.add_node("wait_for_approval", self._wait_for_approval_node)
+        workflow.add_node("generate_post", _dispatch("_generate_post_node"))
         
-        # Node 3: Process human feedback (approve or edit)
-        workflow.add_node("process_feedback", self._process_feedback_node)
+        # Node 2: Wait for and process human feedback (this is where we interrupt)
+        workflow.add_node("process_feedback", _dispatch("_process_feedback_node"))
         
-        # Node 4: Publish to Twitter (if approved)
-        workflow.add_node("publish_post", self._publish_post_node)
+        # Node 3: Publish to Twitter (if approved)
+        workflow.add_node("publish_post", _dispatch("_publish_post_node"))
         
         # Define the workflow edges (how nodes connect)
         
         # Start: Generate post from article
         workflow.set_entry_point("generate_post")
         
-        # After generating, wait for approval (with interrupt)
-        workflow.add_edge("generate_post", "wait_for_approval")
-        
-        # After waiting, process the feedback
-        workflow.add_edge("wait_for_approval", "process_feedback")
+        # After generating, wait for approval (with interrupt) and process the feedback
+        workflow.add_edge("generate_post", "process_feedback")
         
         # After processing feedback, check if approved
         workflow.add_conditional_edges(
             "process_feedback",
-            self._should_publish,  # Decision function
+            _dispatch("_should_publish"),  # Decision function
             {
                 "publish": "publish_post",  # If approved, publish
                 "regenerate": "generate_post",  # If needs editing, regenerate
@@ -107,10 +459,11 @@ class SocialMediaWorkflow:
         # After publishing, end the workflow
         workflow.add_edge("publish_post", END)
         
-        # Compile the graph with checkpointer for state persistence
-        return workflow.compile(checkpointer=self.checkpointer)
+        # Compile the graph; each instance adds its checkpointer in _build_graph
+        # Execution pauses inside "process_feedback" until resumed with feedback
+        return workflow.compile()
     
-    def _generate_post_node(self, state: WorkflowState) -> WorkflowState:
+    def _generate_post_node(self, state: WorkflowState) -> dict:
         """
         Node that generates a social media post from the article.
         
@@ -118,14 +471,15 @@ class SocialMediaWorkflow:
             state: Current workflow state
             
         Returns:
-            Updated state with generated_post field
+            State update with the new generated_post and one more attempt
         """
-        print("\n🤖 Generating post from article...")
+        log.info("🤖 Generating post from article...")
         
         # Check if we need to regenerate based on feedback
         if state.get("human_feedback") and state.get("iteration_count", 0) > 0:
             # Regenerate based on feedback
-            print(f"📝 Regenerating post based on feedback: {state['human_feedback']}")
+            log.info("📝 Regenerating post based on feedback: %s", state["human_feedback"],
+                     extra={"feedback": state["human_feedback"]})
             post = self.post_generator.regenerate_post(
                 state["article"],
                 state["human_feedback"]
@@ -134,62 +488,67 @@ class SocialMediaWorkflow:
             # Generate new post from article
             post = self.post_generator.generate_post(state["article"])
         
-        # Update state with generated post
-        state["generated_post"] = post
-        state["iteration_count"] = state.get("iteration_count", 0) + 1
+        attempt = state.get("iteration_count", 0) + 1
         
-        print(f"✓ Post generated ({state['iteration_count']} attempt):")
-        print(f"\n{'-' * 60}")
-        print(post)
-        print(f"{'-' * 60}\n")
+        log.info("✓ Post generated (%d attempt):", attempt,
+                 extra={"iteration_count": attempt, "post_length": len(post)})
+        # Separators are for reading the output by eye; skip building them otherwise
+        if log.isEnabledFor(logging.DEBUG):
+            log.debug("-" * 60)
+        log.info("%s", post)
+        if log.isEnabledFor(logging.DEBUG):
+            log.debug("-" * 60)
         
-        return state
+        # Return only the changed fields; iteration_count is an increment
+        return {"generated_post": post, "iteration_count": 1}
     
-    def _wait_for_approval_node(self, state: WorkflowState) -> WorkflowState:
+    def _process_feedback_node(self, state: WorkflowState) -> dict:
         """
-        Node that waits for human approval.
-        This node uses LangGraph's interrupt feature to pause execution.
+        Node that waits for human feedback and processes it (approve or edit instructions).
+        
+        The node pauses with LangGraph's interrupt(); the graph is resumed with
+        Command(resume=feedback), and the node then runs again from the top
+        with the feedback as interrupt()'s return value.
         
         Args:
             state: Current workflow state
             
         Returns:
-            State (unchanged, waiting for human input)
+            State update with human_feedback and the is_approved flag
         """
-        print("\n⏸️  Workflow paused - Waiting for human approval...")
-        print("💡 Use the approval script to review and approve/edit the post.")
-        print("   Run: python approve_post.py")
-        
-        # This node doesn't modify state
-        # The interrupt happens automatically when this node is reached
-        # The workflow will pause here until resumed with human feedback
-        
-        return state
-    
-    def _process_feedback_node(self, state: WorkflowState) -> WorkflowState:
-        """
-        Node that processes human feedback (approve or edit instructions).
+        # Pauses here on the first pass; on resume this returns the feedback
+        # At the cap, edit requests end the run instead of regenerating,
+        # so tell the reviewer up front rather than after another round trip
+        feedback = interrupt({
+            "prompt": "approve?",
+            "can_regenerate": state.get("iteration_count", 0) < self.MAX_ITERATIONS
+        })
+        
+        # Callers may resume with a dict of feedback fields instead of plain text
+        if isinstance(feedback, dict):
+            text = feedback.get("human_feedback", "")
+            kind = feedback.get("feedback_kind")
+        else:
+            text = feedback
+            kind = None
         
-        Args:
-            state: Current workflow state with human_feedback
-            
-        Returns:
-            Updated state with is_approved flag
-        """
-        feedback = state.get("human_feedback", "").lower().strip()
+        # Use the caller's classification when available, otherwise parse the text
+        if kind:
+            approved = kind == "approve"
+        else:
+            approved = text.strip().casefold() in APPROVE_TOKENS
         
         # Check if feedback indicates approval
-        if feedback in ["approve", "yes", "ok", "publish", "y"]:
-            state["is_approved"] = True
-            print("\n✓ Post approved by human!")
+        if approved:
+            log.info("✓ Post approved by human!")
         else:
             # Feedback contains editing instructions
-            state["is_approved"] = False
-            print(f"\n📝 Post needs editing. Feedback: {state['human_feedback']}")
+            log.info("📝 Post needs editing. Feedback: %s", text, extra={"feedback": text})
         
-        return state
+        # The classification only applies to this round of feedback
+        return {"human_feedback": text, "feedback_kind": "", "is_approved": approved}
     
-    def _publish_post_node(self, state: WorkflowState) -> WorkflowState:
+    def _publish_post_node(self, state: WorkflowState) -> dict:
         """
         Node that publishes the post to Twitter.
         
@@ -197,31 +556,27 @@ class SocialMediaWorkflow:
             state: Current workflow state
             
         Returns:
-            Updated state with is_published flag
+            State update with the is_published flag
         """
-        from twitter_client import TwitterClient
-        
-        print("\n📤 Publishing post to Twitter...")
+        log.info("📤 Publishing post to Twitter...")
         
         try:
-            # Initialize Twitter client
-            twitter = TwitterClient()
+            # Get the shared Twitter client
+            twitter = _get_twitter_client()
             
             # Publish the post
             result = twitter.publish_post(state["generated_post"])
             
             if result["success"]:
-                state["is_published"] = True
-                print(f"\n✅ {result['message']}")
-            else:
-                print(f"\n❌ Error: {result['error']}")
-                state["is_published"] = False
+                log.info("✅ %s", result["message"], extra={"tweet_id": result.get("tweet_id")})
+                return {"is_published": True}
+            
+            log.error("❌ Error: %s", result["error"])
                 
         except Exception as e:
-            print(f"\n❌ Failed to publish: {str(e)}")
-            state["is_published"] = False
+            log.error("❌ Failed to publish: %s", e)
         
-        return state
+        return {"is_published": False}
     
     def _should_publish(self, state: WorkflowState) -> str:
         """
@@ -233,40 +588,86 @@ class SocialMediaWorkflow:
         Returns:
             "publish" if approved, "regenerate" if needs editing, "end" if max iterations
         """
-        # Check if approved
-        if state.get("is_approved", False):
-            return "publish"
-        
-        # Check if we've exceeded max regeneration attempts (prevent infinite loops)
-        max_iterations = 5
-        if state.get("iteration_count", 0) >= max_iterations:
-            print(f"\n⚠️  Maximum regeneration attempts ({max_iterations}) reached.")
-            return "end"
+        # Approved posts are published; otherwise regenerate until the cap
+        # (prevents infinite loops). This runs before another generate_post,
+        # so a capped run never pays for an LLM call whose result can't be reviewed
+        route = _ROUTE[(
+            bool(state.get("is_approved", False)),
+            state.get("iteration_count", 0) >= self.MAX_ITERATIONS
+        )]
+        
+        if route == "end":
+            log.warning("⚠️  Maximum regeneration attempts (%d) reached.", self.MAX_ITERATIONS)
+        
+        return route
+    
+    def close(self):
+        """
+        Release the checkpointer resources this workflow created.
         
-        # Needs regeneration
-        return "regenerate"
+        Pending checkpoints are stored first. Safe to call more than once.
+        """
+        self._flush_checkpoints()
+        self._resources.close()
     
-    def run(self, article: str, thread_id: str = "default") -> dict:
+    async def aclose(self):
         """
-        Run the workflow with a news article.
+        Async version of close().
+        """
+        await asyncio.to_thread(self.close)
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+    
+    async def __aenter__(self):
+        return self
+    
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.aclose()
+    
+    def _flush_checkpoints(self):
+        """
+        Commit checkpoints held back by batching checkpointers (e.g. BatchedSqliteSaver).
+        """
+        flush = getattr(self.checkpointer, "flush", None)
+        if flush is not None:
+            flush()
+    
+    @staticmethod
+    def initial_state(article: str) -> WorkflowState:
+        """
+        Build the starting state for a new run.
         
         Args:
             article: The news article text
-            thread_id: Unique identifier for this workflow run (for checkpointing)
             
         Returns:
-            Configuration for running the workflow
+            A fresh workflow state
         """
-        # Initial state
-        initial_state = {
+        return {
             "article": article,
             "generated_post": "",
             "human_feedback": "",
+            "feedback_kind": "",
             "is_approved": False,
             "is_published": False,
             "iteration_count": 0
         }
+    
+    def run(self, article: str, thread_id: str = "default") -> dict:
+        """
+        Run the workflow with a news article.
         
+        Args:
+            article: The news article text
+            thread_id: Unique identifier for this workflow run (for checkpointing)
+            
+        Returns:
+            Configuration for running the workflow
+        """
         # Create the workflow configuration with thread_id for checkpointing
         config = {
             "configurable": {
@@ -275,22 +676,94 @@ class SocialMediaWorkflow:
         }
         
         # Run the workflow
-        # The workflow will interrupt at "wait_for_approval" node
-        # Use interrupt_before=["wait_for_approval"] to pause before that node
+        # The workflow will interrupt in the "process_feedback" node
         result = self.graph.invoke(
-            initial_state,
-            config=config
+            self.initial_state(article),
+            config=config,
+            durability=self.DURABILITY
+        )
+        
+        # Make sure the paused/final state is stored before handing control back
+        self._flush_checkpoints()
+        
+        return result
+    
+    async def arun(self, article: str, thread_id: str = "default") -> dict:
+        """
+        Async version of run().
+        
+        The nodes are synchronous, so LangGraph runs them in its thread pool;
+        awaiting several arun() calls together overlaps their LLM requests.
+        The checkpointer must support async access (the in-memory and
+        Postgres/Redis/MongoDB savers do, SqliteSaver does not).
+        
+        Args:
+            article: The news article text
+            thread_id: Unique identifier for this workflow run (for checkpointing)
+            
+        Returns:
+            Workflow state when the run pauses for approval
+        """
+        config = {
+            "configurable": {
+                "thread_id": thread_id
+            }
+        }
+        
+        result = await self.graph.ainvoke(
+            self.initial_state(article),
+            config=config,
+            durability=self.DURABILITY
         )
         
+        # Flushing may block, so keep it off the event loop
+        await asyncio.to_thread(self._flush_checkpoints)
+        
         return result
     
-    def resume(self, human_feedback: str, thread_id: str = "default") -> dict:
+    async def run_batch(self, articles: list, max_concurrency: int = 4, thread_prefix: str = None) -> dict:
+        """
+        Draft posts for several articles concurrently.
+        
+        Each article gets its own thread_id ("{thread_prefix}-{index}") and
+        pauses for approval like a single run() would.
+        
+        Args:
+            articles: The news article texts
+            max_concurrency: Maximum number of runs in flight at once
+                (keep this within what the Ollama server can serve)
+            thread_prefix: Prefix for the generated thread_ids (default: unique
+                per call, so a new batch never overwrites paused threads of an
+                earlier one)
+            
+        Returns:
+            Results keyed by thread_id, in article order; a failed run yields its exception
+        """
+        if thread_prefix is None:
+            thread_prefix = f"batch_{uuid.uuid4().hex[:8]}"
+        
+        thread_ids = [f"{thread_prefix}-{i}" for i in range(len(articles))]
+        semaphore = asyncio.Semaphore(max_concurrency)
+        
+        async def run_one(thread_id, article):
+            async with semaphore:
+                return await self.arun(article, thread_id=thread_id)
+        
+        results = await asyncio.gather(
+            *(run_one(t, article) for t, article in zip(thread_ids, articles)),
+            return_exceptions=True
+        )
+        return dict(zip(thread_ids, results))
+    
+    def resume(self, human_feedback: str, thread_id: str = "default", debug: bool = False) -> dict:
         """
         Resume the workflow after human provides feedback.
         
         Args:
             human_feedback: "approve" or editing instructions
             thread_id: The same thread_id used in the initial run
+            debug: Load state through graph.get_state (slower, full snapshot)
+                instead of reading the checkpoint tuple directly
             
         Returns:
             Final workflow state
@@ -302,23 +775,39 @@ class SocialMediaWorkflow:
             }
         }
         
-        # Update state with human feedback
-        # We need to update the state and then continue execution
-        current_state = self.graph.get_state(config)
+        # Make sure there is a paused workflow to resume
+        # Reading the checkpoint tuple directly is much cheaper than
+        # building a full StateSnapshot
+        if debug:
+            current_state = self.graph.get_state(config)
+            values = current_state.values if current_state is not None else None
+            paused = current_state is not None and bool(current_state.next)
+        else:
+            tup = self.checkpointer.get_tuple(config)
+            values = tup.checkpoint["channel_values"] if tup is not None else None
+            # A paused run has its interrupt recorded as a pending write
+            paused = tup is not None and any(
+                write[1] == _INTERRUPT_CHANNEL for write in tup.pending_writes
+            )
         
-        if current_state is None or current_state.values == {}:
+        if not values:
             raise ValueError(f"No workflow state found for thread_id: {thread_id}")
         
-        # Update the state with feedback
-        updated_state = current_state.values.copy()
-        updated_state["human_feedback"] = human_feedback
+        # Resuming a finished run would silently do nothing
+        if not paused:
+            raise ValueError(f"Workflow for thread_id {thread_id} has already finished")
         
         # Continue execution from where it was interrupted
-        # The workflow will continue from "wait_for_approval" node
+        # The feedback is handed to the "process_feedback" node as interrupt()'s
+        # return value, so the rest of the state is never copied or re-sent
         result = self.graph.invoke(
-            updated_state,
-            config=config
+            Command(resume=human_feedback),
+            config=config,
+            durability=self.DURABILITY
         )
         
+        # Make sure the paused/final state is stored before handing control back
+        self._flush_checkpoints()
+        
         return result
 